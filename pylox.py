@@ -5,9 +5,32 @@ from src.error import ErrorHandler
 from src.environment import Environment
 from src.interpreter import Interpreter
 from src.parser import Parser
+from src.resolver import Resolver
 from src.preprocessor import Preprocessor
 from src.tokenizer import Token, TokenType, Tokenizer
+from collections import OrderedDict
+from hashlib import sha256
+from locale import getpreferredencoding
 from sys import argv
+from types import SimpleNamespace
+
+#parsed programs keyed by source digest, evicted in least recently used order
+program_cache = OrderedDict()
+program_cache_limit = 128
+
+#front end passes are reused across runs, each resets its state on entry
+preprocessor = Preprocessor()
+tokenizer = Tokenizer()
+parser = Parser()
+resolver = Resolver()
+
+#interpreter state carried between runs, see the note in the entry point
+state = SimpleNamespace(
+    env = None,
+    tok_debug = False,
+    parse_debug = False,
+    env_debug = False
+)
 
 # lox repl
 def exec_prompt() -> None:
@@ -21,71 +44,102 @@ def exec_prompt() -> None:
 
 # fetch lox source from file
 def exec_file(fname: str) -> None:
+    #read raw bytes through a large buffer and decode them in a single pass
     try:
-        with open(fname, 'r') as file:
-            p_src: str = file.read()
-
-            if p_src[-1] != '\n':
-                p_src += '\n'
-
-            src = preprocess(p_src)
-            run(src)
+        with open(fname, 'rb', buffering = 1 << 20) as file:
+            data: bytes = file.read()
     except FileNotFoundError:
         print("{} file not found".format(fname))
+        return
+
+    #scripts that are not utf-8 fall back to the default encoding of open()
+    try:
+        p_src: str = data.decode('utf-8')
+    except UnicodeDecodeError:
+        p_src = data.decode(getpreferredencoding(False))
+
+    if not p_src.endswith('\n'):
+        p_src += '\n'
+
+    src = preprocess(p_src)
+    run(src)
 
 #execute preprocessor
 def preprocess(p_src: str) -> str:
-    global tok_debug
-    global parse_debug
-    global env_debug
-
-    pps = Preprocessor()
-    src, flags = pps.scan(p_src)
+    src, flags = preprocessor.scan(p_src)
 
-    tok_debug = flags["tok_debug"]
-    parse_debug = flags["parse_debug"]
-    env_debug = flags["env_debug"]
+    state.tok_debug = flags["tok_debug"]
+    state.parse_debug = flags["parse_debug"]
+    state.env_debug = flags["env_debug"]
 
     return src
 
 #execute lox source code
 def run(src: str) -> None:
-    global env
+    #blank lines, common in the REPL, have nothing to tokenize
+    if not src or src.isspace():
+        return
+
+    #repeated source skips tokenization and parsing entirely. the cache is
+    #bypassed while debugging so that tokens and trees are always displayed.
+    key = sha256(src.encode()).digest()
+    program = None
+
+    if not (state.tok_debug or state.parse_debug):
+        program = program_cache.get(key)
+
+    if program is not None:
+        program_cache.move_to_end(key)
+    else:
+        program = parse(src)
 
+        if program is None:
+            return
+
+        program_cache[key] = program
+
+        if len(program_cache) > program_cache_limit:
+            program_cache.popitem(last = False)
+
+    #interpretation
+    itr = Interpreter(state.env)
+    exit_status, err, state.env = itr.interpret(program)
+    display_errors(err, "LOX: RUNTIME ERROR")
+
+    if state.env_debug:
+        print(state.env.map)
+
+#tokenize and parse lox source code, returns None on error or empty source
+def parse(src: str):
     #tokenization
-    tkz = Tokenizer()
-    tokens, err = tkz.tokenize(src)
+    tokens, err = tokenizer.tokenize(src)
 
-    if tok_debug:
+    if state.tok_debug:
         for i in tokens:
             print(i)
 
     if display_errors(err, "LOX: SYNTAX ERROR"):
-        return
+        return None
 
     #don't send single EOF token to parser
     #this allows parser to make stricter assertions while generating the AST
     if tokens[0].type == TokenType.EOF:
-        return
+        return None
 
     #parsing
-    prs = Parser()
-    program, err = prs.parse(tokens)
+    program, err = parser.parse(tokens)
 
-    if parse_debug:
+    if state.parse_debug:
         for tree in program:
             print(tree)
 
     if display_errors(err, "LOX: GRAMMAR ERROR"):
-        return
+        return None
 
-    #interpretation
-    itr = Interpreter(env)
-    exit_status, err, env = itr.interpret(program)
-    display_errors(err, "LOX: RUNTIME ERROR")
+    #static scope resolution, annotates the trees in place
+    resolver.resolve(program)
 
-    if env_debug:
-        print(env.map)
+    return program
 
 #error trap
 def display_errors(err, header) -> bool:
@@ -101,18 +155,12 @@ def display_errors(err, header) -> bool:
 
 #lox entry point, repl or source
 if __name__ == "__main__":
-    tok_debug = False
-    parse_debug = False
-    env_debug = False
-
-    #global environment for REPL
+    #global environment for REPL, held in state.env
     #not strictly a great idea for a real interpreter. however, I was playing
     #around with experiments involving writing an evironment to disk and setting
     #up shared memory maps over the environment while the repl is executing.
     #I left it in as a note to revisit these ideas, and it also allows for the
     #preprocessor to easily set up a pragma flag for environment debugging.
-    env = None
-
     argc: int = len(argv)
 
     if (argc == 1):
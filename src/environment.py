@@ -5,44 +5,56 @@
 # stack structure. Since python does not have explicit pointers, a parent
 # attribute contains the reference to the immediate parent environment. When the
 # attribute is None, then the environment must be the global environment.
+#
+# The resolver (see src/resolver.py) assigns every block-scoped variable a slot
+# index and every access the number of scopes between it and its declaration.
+# Block environments therefore hold their values in a list indexed by slot and
+# never search by name. Globals remain keyed by name in the map of the root
+# environment so that the REPL can carry them between runs.
+
+#free list of released environments, bounded so an unusually deep program does
+#not pin its peak number of scopes in memory forever.
+_POOL = []
+_POOL_LIMIT = 64
 
 class Environment():
-    def __init__(self, parent):
-        self.parent = parent
-        self.map = {}
+    __slots__ = ('parent', 'map', 'slots')
 
-    def insert(self, key, val):
-        """/
-        insert a k-v pair into the environment. if the key already exists, the
-        environment overrides the current value. This allows the user to declare
-        a variable multiple times within the same scope.
+    def __init__(self, parent, size = 0):
+        """\
+        @parent: enclosing environment, None for the global environment
+        @map: global variables keyed by name, empty in block environments
+        @slots: block-scoped variables indexed by resolver slot
         """
-        self.map[key] = val
+        self.parent = parent
+        self.map = {}
+        self.slots = [None] * size
 
-    def search(self, key):
+    @classmethod
+    def acquire(cls, parent, size = 0):
         """\
-        access a k-v pair from the environment. if it does not exist, search
-        the parent environments. if it does not exist in the entire environment
-        chain, the python KeyError propogates back to the calling tree node.
+        fetch an environment from the free list, or build a new one when the
+        list is exhausted. pair with self.release() on scope exit.
         """
-        try:
-            return self.map[key]
-        except KeyError as err:
-            if self.parent:
-                return self.parent.search(key)
-            else:
-                raise err
+        if _POOL:
+            env = _POOL.pop()
+            env.parent = parent
+            env.slots = [None] * size
+            return env
 
-    def modify(self, key, val):
+        return cls(parent, size)
+
+    def release(self):
         """\
-        modify a k-v pair in the environment only if it exists. modifications
-        are not allowed to trigger insertions. If the pair does not exist in
-        this environment, check the parent environment.
+        return a dead environment to the free list. the caller must hold the
+        only reference, which is always true of a block scope since lox does not
+        have closures.
         """
-        if key in self.map:
-            self.map[key] = val
-        else:
-            if self.parent:
-                self.parent.modify(key, val)
-            else:
-                raise KeyError
+        #only the global environment keys variables by name, so a block scope
+        #must never reach the free list carrying names into the next block
+        assert(not self.map)
+
+        if len(_POOL) < _POOL_LIMIT:
+            self.parent = None
+            self.slots = None
+            _POOL.append(self)
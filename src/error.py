@@ -18,41 +18,55 @@ class ErrorHandler():
     def __init__(self, limit: int = 10) -> None:
         """\
         @limit: maximum capacity, negative indicates no threshold
-        @queue: FIFO via self.push() and self.__iter__()
+        @queue: FIFO via self.push() and self.__iter__(), preallocated to limit
+        @idx: number of errors currently held in the queue
         """
         self.__limit = limit
-        self.__queue = []
+        self.__queue = [None] * max(limit, 0)
+        self.__idx = 0
 
     def push(self, line: int, error: str) -> bool:
         """\
-        load an error onto the queue formated as 'line x: description'
+        load an error onto the queue, see self.__iter__() for the format.
         @line: offending line number, if negative then supressed
         @error: description
         returns: False if queue is already at maximum capacity
         """
-        if len(self.__queue) == self.__limit:
+        if self.__idx == self.__limit:
             return False
 
-        if line >= 0:
-            msg = "line {}: {}".format(line, error)
-        else:
-            msg = "{}".format(error)
+        msg = (line, error)
 
-        self.__queue.append(msg)
+        #only an unbounded handler can outgrow its preallocated queue
+        try:
+            self.__queue[self.__idx] = msg
+        except IndexError:
+            self.__queue.append(msg)
+
+        self.__idx += 1
         return True
 
     def grow(self, inc: int) -> bool:
         if inc > 0:
             self.__limit = self.__limit + inc
+            self.__queue.extend([None] * inc)
             return True
 
         return False
 
     def reset(self) -> None:
-        self.__queue = []
+        self.__idx = 0
 
     def __bool__(self):
-        return bool(self.__queue)
+        return self.__idx > 0
 
     def __iter__(self):
-        return iter(self.__queue)
+        """\
+        errors are formatted as 'line x: description' only once they are read,
+        so callers that merely test bool(handler) never pay for formatting.
+        """
+        for line, error in self.__queue[:self.__idx]:
+            if line >= 0:
+                yield "line {}: {}".format(line, error)
+            else:
+                yield "{}".format(error)
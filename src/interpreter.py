@@ -4,8 +4,6 @@
 
 from src.error import ErrorHandler, RuntimeError
 from src.environment import Environment
-from src.node import Binary, Unary, Literal, Grouping
-from src.node import Generic, Printer
 
 class Interpreter():
     def __init__(self, env):
@@ -18,11 +16,15 @@ class Interpreter():
 
     def interpret(self, program):
         """\
-        depth-first post-order traversal of program tree
+        depth-first post-order traversal of program tree. each node dispatches
+        to its own interpret method, so there is no jump table to maintain.
         """
+        err = self.err
+        env = self.env
+
         for tree in program:
             try:
-                tree.interpret(self.err, self.env)
+                tree.interpret(err, env)
             except RuntimeError:
                 assert(self.env.parent is None)
                 return (1, self.err, self.env)
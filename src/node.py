@@ -2,63 +2,131 @@
 # MIT License
 # abstract syntax tree node classes for both statements and expressions
 
-from abc import ABC, abstractmethod
+import operator as op
 from src.error import ErrorHandler, RuntimeError
 from src.environment import Environment
 from src.tokenizer import Token, TokenType
 
-def truthfulness(val):
-    if val == None or val == False:
-        return False
+# lox truthfulness: a value is false only when (val is None or val is False).
+# the identity tests matter, since 0.0 == False would make the number zero false.
+# the test is written inline at each use rather than through a helper function
+# because conditions and logical operators sit on the hottest interpreter paths.
 
-    return True
+################################################################################
+# binary operator semantics
+# operands are already evaluated; a TypeError signals mismatched operand types.
+# lox values are never subclassed, so exact type tests stand in for isinstance.
+
+def binary_plus(x, y):
+    if type(x) is float and type(y) is float:
+        return x + y
+    elif type(x) is str and type(y) is str:
+        return x + y
+
+    raise TypeError
+
+def binary_minus(x, y):
+    if type(x) is float and type(y) is float:
+        return x - y
+
+    raise TypeError
+
+def binary_star(x, y):
+    if type(x) is float and type(y) is float:
+        return x * y
+
+    raise TypeError
+
+def binary_slash(x, y):
+    if type(x) is float and type(y) is float:
+        return x / y
+
+    raise TypeError
+
+def binary_greater(x, y):
+    if type(x) is float and type(y) is float:
+        return x > y
+
+    raise TypeError
+
+def binary_less(x, y):
+    if type(x) is float and type(y) is float:
+        return x < y
+
+    raise TypeError
+
+def binary_greater_equal(x, y):
+    if type(x) is float and type(y) is float:
+        return x >= y
+
+    raise TypeError
+
+def binary_less_equal(x, y):
+    if type(x) is float and type(y) is float:
+        return x <= y
+
+    raise TypeError
 
 ################################################################################
 # expression-type nodes
 
-class expr(ABC):
+class expr():
     """\
-    abstract base class of all expression-type nodes.
+    base class of all expression-type nodes. not an abc.ABC, isinstance()
+    against an ABC runs a python-level __instancecheck__ on every call.
     """
-    @abstractmethod
-    def __repr__(self):
-        """\
-        print AST when preprocessor enforces #pragma parse_debug on
-        """
-        pass
+    __slots__ = ()
 
-    @abstractmethod
-    def interpret(self, err, env):
-        """\
-        recursively interpret node and return computed value.
-        """
-        pass
+    #every subclass provides:
+    #__repr__(self): print AST when preprocessor enforces #pragma parse_debug on
+    #interpret(self, err, env): recursively interpret node and return computed
+    #value.
 
 class Literal(expr):
+    __slots__ = ('val', 'value')
+
     def __init__(self, val):
+        #the token is kept for printing, its literal is copied out of it once
         self.val = val
+        self.value = val.literal
 
     def __repr__(self):
-        return "{}".format(self.val.lexeme)
+        return f"{self.val.lexeme}"
 
     def interpret(self, err, env):
-        return self.val.literal
+        return self.value
 
 class Variable(expr):
+    __slots__ = ('name', 'depth', 'slot')
+
     def __init__(self, name):
         #name is just an identifier-type token;
         #only the lexeme itself gets inserted into the environement.
         #storing the entire token here just allows for clearer error msgs.
         self.name = name
 
+        #depth and slot are set by the resolver, a slot of None denotes a global
+        #variable. they are left unset until then, so that interpreting an
+        #unresolved tree raises AttributeError rather than running every
+        #variable as a global of the current environment.
+
     def __repr__(self):
-        return "{}".format(self.name.lexeme)
+        return f"{self.name.lexeme}"
 
     def interpret(self, err, env):
+        depth = self.depth
+
+        while depth:
+            env = env.parent
+            depth -= 1
+
+        if self.slot is not None:
+            return env.slots[self.slot]
+
         key = self.name.lexeme
 
         try:
-            return env.search(key)
+            return env.map[key]
         except KeyError:
             line = self.name.line
             msg = "attempted to access undefined variable '{}'".format(key)
@@ -66,162 +134,177 @@ class Variable(expr):
             raise RuntimeError
 
 class Unary(expr):
+    __slots__ = ('operator', 'right', 'is_neg')
+
     def __init__(self, operator, right):
         self.operator = operator
         self.right = right
 
+        #classify the operator once at construction rather than per evaluation
+        self.is_neg = operator.type == TokenType.MINUS
+
     def __repr__(self):
-        return "({} {})".format(self.operator.lexeme, self.right)
+        return f"({self.operator.lexeme} {self.right})"
 
     def interpret(self, err, env):
         val = self.right.interpret(err, env)
 
-        if self.operator.type == TokenType.MINUS:
-            if isinstance(val, float):
-                return -1 * float(val)
+        if not self.is_neg:
+            return val is None or val is False
 
-            line = self.operator.line
-            msg = "operand of '-' must be a number"
-            err.push(line, msg)
-            raise RuntimeError
+        if type(val) is float:
+            return -val
 
-        elif self.operator.type == TokenType.BANG:
-            return not truthfulness(val)
+        line = self.operator.line
+        msg = "operand of '-' must be a number"
+        err.push(line, msg)
+        raise RuntimeError
 
 class Binary(expr):
+    __slots__ = ('left', 'operator', 'right', 'op_fn')
+
     def __init__(self, left, operator, right):
         self.left = left
         self.operator = operator
         self.right = right
 
+        #classify the operator once at construction rather than per evaluation
+        self.op_fn = Binary.dispatch[operator.type]
+
     def __repr__(self):
-        msg = "({} {} {})"
-        return msg.format(self.operator.lexeme, self.left, self.right)
+        return f"({self.operator.lexeme} {self.left} {self.right})"
 
     def interpret(self, err, env):
         lval = self.left.interpret(err, env)
         rval = self.right.interpret(err, env)
 
-        type = self.operator.type
-
-        if type in Binary.dispatch_any:
-            return Binary.dispatch_any[type](lval, rval)
-        elif isinstance(lval, float) and isinstance(rval, float):
-            return Binary.dispatch_float[type](lval, rval)
-        elif type == TokenType.PLUS:
-            if isinstance(lval, str) and isinstance(rval, str):
-                return lval + rval
-
-        line = self.operator.line
-        lexeme = self.operator.lexeme
-        msg = "cannot perform '{}' on mismatched types".format(lexeme)
-        err.push(line, msg)
-        raise RuntimeError
+        try:
+            return self.op_fn(lval, rval)
+        except TypeError:
+            line = self.operator.line
+            lexeme = self.operator.lexeme
+            msg = "cannot perform '{}' on mismatched types".format(lexeme)
+            err.push(line, msg)
+            raise RuntimeError
+        except ZeroDivisionError:
+            err.push(self.operator.line, "division by zero")
+            raise RuntimeError
 
-    dispatch_any = {
+    #each entry receives evaluated operands and raises a TypeError when the
+    #operand types are not valid for the operator.
+    dispatch = {
         #python equality is the same as lox equality
-        TokenType.EQUAL_EQUAL:      lambda x, y: x == y,
-        TokenType.BANG_EQUAL:       lambda x, y: x != y
-    }
-
-    dispatch_float = {
-        TokenType.PLUS:             lambda x, y: x + y,
-        TokenType.MINUS:            lambda x, y: x - y,
-        TokenType.STAR:             lambda x, y: x * y,
-        TokenType.SLASH:            lambda x, y: x / y,
-        TokenType.GREATER:          lambda x, y: x > y,
-        TokenType.LESS:             lambda x, y: x < y,
-        TokenType.GREATER_EQUAL:    lambda x, y: x >= y,
-        TokenType.LESS_EQUAL:       lambda x, y: x <= y,
+        TokenType.EQUAL_EQUAL:      op.eq,
+        TokenType.BANG_EQUAL:       op.ne,
+        TokenType.PLUS:             binary_plus,
+        TokenType.MINUS:            binary_minus,
+        TokenType.STAR:             binary_star,
+        TokenType.SLASH:            binary_slash,
+        TokenType.GREATER:          binary_greater,
+        TokenType.LESS:             binary_less,
+        TokenType.GREATER_EQUAL:    binary_greater_equal,
+        TokenType.LESS_EQUAL:       binary_less_equal
     }
 
 class Grouping(expr):
+    __slots__ = ('val',)
+
     def __init__(self, val):
         self.val = val
 
     def __repr__(self):
-        return "(group {})".format(self.val)
+        return f"(group {self.val})"
 
     def interpret(self, err, env):
         return self.val.interpret(err, env)
 
 class Assignment(expr):
+    __slots__ = ('lval', 'rval', 'depth', 'slot')
+
     def __init__(self, lval, rval):
         #l values are tokens, r values are tree nodes
         self.lval = lval
         self.rval = rval
 
+        #depth and slot are set by the resolver, see Variable.__init__()
+
     def __repr__(self):
-        return "(= {} {})".format(self.lval.lexeme, self.rval)
+        return f"(= {self.lval.lexeme} {self.rval})"
 
     def interpret(self, err, env):
-        key = self.lval.lexeme
         val = self.rval.interpret(err, env)
+        depth = self.depth
 
-        try:
-            env.modify(key, val)
-        except KeyError:
+        while depth:
+            env = env.parent
+            depth -= 1
+
+        if self.slot is not None:
+            env.slots[self.slot] = val
+            return val
+
+        key = self.lval.lexeme
+
+        #modifications are not allowed to trigger insertions
+        if key not in env.map:
             line = self.lval.line
             msg = "variable '{}' not declared prior to assignment".format(key)
             err.push(line, msg)
             raise RuntimeError
 
+        env.map[key] = val
         return val
 
 class Logical(expr):
+    __slots__ = ('left', 'operator', 'right', 'is_or')
+
     def __init__(self, left, operator, right):
         self.left = left
         self.operator = operator
         self.right = right
 
+        #classify the operator once at construction rather than per evaluation
+        self.is_or = operator.type == TokenType.OR
+
     def __repr__(self):
-        lexeme = self.operator.lexeme
-        return "({} {} {})".format(lexeme, self.left, self.right)
+        return f"({self.operator.lexeme} {self.left} {self.right})"
 
     def interpret(self, err, env):
         #return val as the expression value
         #it provides an extra level of information over a simple true/false
         val = self.left.interpret(err, env)
 
-        if self.operator.type == TokenType.OR:
-            if truthfulness(val):
-                return val
-        if self.operator.type == TokenType.AND:
-            if not truthfulness(val):
-                return val
+        #the right operand is only evaluated when the left cannot decide
+        if (val is None or val is False) != self.is_or:
+            return val
 
         return self.right.interpret(err, env)
 
 ################################################################################
 # statement-type nodes
 # these nodes are essentially identical to expression-type nodes but the
-# underlying abstract base class allows for helpful isinstance() distinctions
+# underlying base class allows for helpful isinstance() distinctions
 # to be made during parsing and interpretation.
 
-class stmt(ABC):
+class stmt():
     """\
-    abstract base class of all statement-type nodes
+    base class of all statement-type nodes
     """
-    @abstractmethod
-    def __repr__(self):
-        """\
-        print AST when preprocessor enforces #pragma parse_debug on
-        """
-        pass
+    __slots__ = ()
 
-    @abstractmethod
-    def interpret(self, err, env):
-        """\
-        recursively interpret node and return computed value.
-        """
-        pass
+    #every subclass provides:
+    #__repr__(self): print AST when preprocessor enforces #pragma parse_debug on
+    #interpret(self, err, env): recursively interpret node and return computed
+    #value.
 
 class Generic(stmt):
+    __slots__ = ('expr',)
+
     def __init__(self, expr):
         self.expr = expr
 
     def __repr__(self):
-        return "(generic {})".format(self.expr)
+        return f"(generic {self.expr})"
 
     def interpret(self, err, env):
         self.expr.interpret(err, env)
@@ -229,11 +312,13 @@ class Generic(stmt):
 
 #todo: pretty printing
 class Printer(stmt):
+    __slots__ = ('expr',)
+
     def __init__(self, expr):
         self.expr = expr
 
     def __repr__(self):
-        return "(print {})".format(self.expr)
+        return f"(print {self.expr})"
 
     def interpret(self, err, env):
         val = self.expr.interpret(err, env)
@@ -241,70 +326,102 @@ class Printer(stmt):
         return None
 
 class VariableDeclaration(stmt):
+    __slots__ = ('name', 'initializer', 'slot')
+
     def __init__(self, name, initializer):
         self.name = name
         self.initializer = initializer
 
+        #set by the resolver, a slot of None denotes a global variable. left
+        #unset until then, see Variable.__init__()
+
     def __repr__(self):
-        return "(declare {} {})".format(self.name.lexeme, self.initializer)
+        return f"(declare {self.name.lexeme} {self.initializer})"
 
     def interpret(self, err, env):
         """\
-        insert k-v pair into environment. if the initializer is None, lox will
-        interpret this as nil.
+        bind the initializer value to the variable. if the initializer is None,
+        lox will interpret this as nil. a variable may be declared multiple
+        times within the same scope, the latest declaration overrides.
         """
-        key = self.name.lexeme
         value = self.initializer.interpret(err, env)
-        env.insert(key, value)
+
+        if self.slot is None:
+            env.map[self.name.lexeme] = value
+        else:
+            env.slots[self.slot] = value
 
 class Block(stmt):
+    __slots__ = ('statements', 'size')
+
     def __init__(self, statements):
         self.statements = statements
 
-    def __repr__(self):
-        header = ""
-
-        for i in self.statements:
-            header += "\n\t{}".format(i)
+        #number of variable slots, set by the resolver. None marks a block that
+        #declares nothing and so runs in its parent environment. left unset
+        #until then, see Variable.__init__()
 
+    def __repr__(self):
+        header = "".join([f"\n\t{i}" for i in self.statements])
         return header[1:]
 
     def interpret(self, err, parent_env):
-        # let python GC synthentically push the child environment off the cactus
-        # stack. Any parent node of this block node will contain the unmodified
-        # reference to the parent environment.
-        child_env = Environment(parent_env)
+        if self.size is None:
+            for tree in self.statements:
+                tree.interpret(err, parent_env)
+
+            return
+
+        # the child environment is pushed onto the cactus stack for the duration
+        # of the block and then recycled. Any parent node of this block node
+        # will contain the unmodified reference to the parent environment. If a
+        # runtime error unwinds through the block, the child is left to the GC.
+        child_env = Environment.acquire(parent_env, self.size)
 
         for tree in self.statements:
             tree.interpret(err, child_env)
 
+        child_env.release()
+
 class Branch(stmt):
+    __slots__ = ('condition', 'then_branch', 'else_branch')
+
     def __init__(self, condition, then_branch, else_branch):
         self.condition = condition
         self.then_branch = then_branch
         self.else_branch = else_branch
 
     def __repr__(self):
-        msg = "(if {} {} {} )"
-        return msg.format(self.condition, self.then_branch, self.else_branch)
+        return f"(if {self.condition} {self.then_branch} {self.else_branch} )"
 
     def interpret(self, err, env):
         #may not evaluate at all if there is no else branch and the condition
         #fails.
-        if truthfulness(self.condition.interpret(err, env)):
+        val = self.condition.interpret(err, env)
+
+        if not (val is None or val is False):
             self.then_branch.interpret(err, env)
         elif self.else_branch is not None:
             self.else_branch.interpret(err, env)
 
 class Loop(stmt):
+    __slots__ = ('condition', 'body')
+
     def __init__(self, condition, body):
         self.condition = condition
         self.body = body
 
     def __repr__(self):
-        msg = "(while {} {})".format(self.condition, self.body)
-        return msg
+        return f"(while {self.condition} {self.body})"
 
     def interpret(self, err, env):
-        while truthfulness(self.condition.interpret(err, env)):
-            self.body.interpret(err, env)
+        condition = self.condition
+        body = self.body
+
+        while True:
+            val = condition.interpret(err, env)
+
+            if val is None or val is False:
+                break
+
+            body.interpret(err, env)
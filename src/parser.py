@@ -12,16 +12,16 @@ from src.node import Generic, Printer, VariableDeclaration, Block, Branch
 from src.node import Loop
 
 class Parser():
+    __slots__ = ('err', 'tokens', 'i')
+
     def __init__(self):
         """\
         convert a list of tokens to an abstract syntax tree
         @i: tokens index
-        @ast: abstract syntax tree generated by self.expression()
         """
         self.err = ErrorHandler()
         self.tokens = []
         self.i = 0
-        self.ast = None
 
     def parse(self, tokens, limit = 10):
         """\
@@ -39,26 +39,9 @@ class Parser():
             return (self.program(), self.err)
         except ParseError:
             return (None, self.err)
-
-    def curr_type(self):
-        """\
-        helper function: returns token type of token at current list index
-        """
-        token = self.tokens[self.i]
-        return token.type
-
-    def curr_token(self):
-        """\
-        helper function: syntactic sugar to fetch current token
-        """
-        return self.tokens[self.i]
-
-    def advance(self):
-        """\
-        helper function: syntactic sugar for iteration over the tokens list
-        """
-        assert(self.i + 1 < len(self.tokens))
-        self.i += 1
+        finally:
+            #don't pin the token list until the next parse
+            self.tokens = []
 
     def prev_token(self):
         """\
@@ -68,11 +51,12 @@ class Parser():
         return self.tokens[self.i - 1]
 
     def check_semicolon(self):
-        if self.curr_type() == TokenType.SEMICOLON:
-            self.advance()
+        tok = self.tokens[self.i]
+
+        if tok.type == TokenType.SEMICOLON:
+            self.i += 1
             return True
         else:
-            tok = self.curr_token()
             if tok.type == TokenType.EOF:
                 self.trap("expected ';' at end of file")
             else:
@@ -84,20 +68,21 @@ class Parser():
         """\
         <program> := <declaration>* EOF
         """
+        tokens = self.tokens
         tree = []
+        append = tree.append
 
-        while self.curr_type() != TokenType.EOF:
-            tree.append(self.declaration())
+        while tokens[self.i].type != TokenType.EOF:
+            append(self.declaration())
 
-        assert(self.curr_type() == TokenType.EOF)
         return tree
 
     def declaration(self):
         """\
         <declaration> := <variable declaration> | <statement>
         """
-        if self.curr_type() == TokenType.VAR:
-            self.advance()
+        if self.tokens[self.i].type == TokenType.VAR:
+            self.i += 1
             return self.var_declaration()
 
         return self.statement()
@@ -106,22 +91,23 @@ class Parser():
         """\
         <var_declaration> := "var" IDENTIFIER ("=" <expression>)? ";"
         """
-        name = None
-
         #if no initializer is present, assume that there was actually
         #an intializer to nil, i.e., var x = nil; instead of var x;
-        initializer = Literal(Token(TokenType.NIL, -1, "nil", None))
+        initializer = Parser.nil
 
-        if self.curr_type() == TokenType.IDENTIFIER:
-            name = self.curr_token()
-            self.advance()
+        tokens = self.tokens
+        name = tokens[self.i]
 
-            if self.curr_type() == TokenType.EQUAL:
-                self.advance()
+        if name.type == TokenType.IDENTIFIER:
+            self.i += 1
+
+            if tokens[self.i].type == TokenType.EQUAL:
+                self.i += 1
                 initializer = self.expression()
 
             self.check_semicolon()
         else:
+            name = None
             self.trap("missing variable identifier")
 
         return VariableDeclaration(name, initializer)
@@ -132,30 +118,13 @@ class Parser():
                        <block statement> | <if statement> | <while statement> |
                        <for statement>
         """
-        # this isn't the world's fastest code, a jump table or dictionary-based
-        # switch would be better, but hey we're writing an interpreter in
-        # python! This is hardly the bottleneck!
-
-        if self.curr_type() == TokenType.PRINT:
-            self.advance()
-            stmt = self.print_stmt()
-        elif self.curr_type() == TokenType.LEFT_BRACE:
-            self.advance()
-            stmt_list = self.block_stmt()
-            stmt = Block(stmt_list)
-        elif self.curr_type() == TokenType.IF:
-            self.advance()
-            stmt = self.branch_stmt()
-        elif self.curr_type() == TokenType.WHILE:
-            self.advance()
-            stmt = self.while_stmt()
-        elif self.curr_type() == TokenType.FOR:
-            self.advance()
-            stmt = self.for_stmt()
-        else:
-            stmt = self.generic_stmt()
+        handler = Parser.stmt_table.get(self.tokens[self.i].type)
 
-        return stmt
+        if handler is None:
+            return self.generic_stmt()
+
+        self.i += 1
+        return handler(self)
 
     def print_stmt(self):
         """\
@@ -172,45 +141,52 @@ class Parser():
         it is used for both generic block statements and function blocks. The
         caller must wrap the list into the appropriate node class.
         """
+        tokens = self.tokens
         stmt_list = []
+        append = stmt_list.append
 
-        while self.curr_type() != TokenType.RIGHT_BRACE:
-            expr = self.declaration()
-            stmt_list.append(expr)
+        #stopping at EOF as well lets an unclosed block be reported as such
+        while tokens[self.i].type not in Parser.block_end_types:
+            append(self.declaration())
 
-        if self.curr_type() == TokenType.EOF:
+        if tokens[self.i].type == TokenType.EOF:
             self.trap("expected '}' at end of file")
-        elif self.curr_type() != TokenType.RIGHT_BRACE:
-            tok = self.curr_token()
-            self.trap("expected '}' at {}".format(tok.lexeme))
         else:
-            self.advance()
+            self.i += 1
 
         return stmt_list
 
+    def block(self):
+        """\
+        wrap a generic block statement into its node, see self.block_stmt()
+        """
+        return Block(self.block_stmt())
+
     def branch_stmt(self):
         """\
         <branch> := "if" "(" <expr> ")" <stmt> ("else" <stmt>)?
         """
-        if self.curr_type() != TokenType.LEFT_PAREN:
+        tokens = self.tokens
+
+        if tokens[self.i].type != TokenType.LEFT_PAREN:
             self.trap("expected open parenthesis after 'if'")
             return Branch(None, None, None)
 
-        self.advance()
+        self.i += 1
 
         condition = self.expression()
 
-        if self.curr_type() != TokenType.RIGHT_PAREN:
+        if tokens[self.i].type != TokenType.RIGHT_PAREN:
             self.trap("expected close parenthesis after condition")
             return Branch(None, None, None)
 
-        self.advance()
+        self.i += 1
 
         then_branch = self.statement()
         else_branch = None
 
-        if self.curr_type() == TokenType.ELSE:
-            self.advance()
+        if tokens[self.i].type == TokenType.ELSE:
+            self.i += 1
             else_branch = self.statement()
 
         return Branch(condition, then_branch, else_branch)
@@ -219,19 +195,21 @@ class Parser():
         """
         <while> := "while" "(" <expression> ")" <statement>
         """
-        if self.curr_type() != TokenType.LEFT_PAREN:
+        tokens = self.tokens
+
+        if tokens[self.i].type != TokenType.LEFT_PAREN:
             self.trap("expected open parenthesis after 'if'")
             return Loop(None, None)
 
-        self.advance()
+        self.i += 1
 
         condition = self.expression()
 
-        if self.curr_type() != TokenType.RIGHT_PAREN:
+        if tokens[self.i].type != TokenType.RIGHT_PAREN:
             self.trap("expected close parenthesis after condition")
             return Loop(None, None)
 
-        self.advance()
+        self.i += 1
 
         body = self.statement()
 
@@ -244,26 +222,28 @@ class Parser():
 
         for statements are desugared into an equivalent while statement.
         """
-        if self.curr_type() != TokenType.LEFT_PAREN:
+        tokens = self.tokens
+
+        if tokens[self.i].type != TokenType.LEFT_PAREN:
             self.trap("expected '(' after 'for'")
             return Loop(None, None)
 
-        self.advance()
+        self.i += 1
 
         initializer = None
 
-        if self.curr_type() == TokenType.SEMICOLON:
-            self.advance()
-        elif self.curr_type() == TokenType.VAR:
-            self.advance()
+        if tokens[self.i].type == TokenType.SEMICOLON:
+            self.i += 1
+        elif tokens[self.i].type == TokenType.VAR:
+            self.i += 1
             initializer = self.var_declaration()
         else:
             initializer = self.generic_stmt()
 
         condition = None
 
-        if self.curr_type() == TokenType.SEMICOLON:
-            self.advance()
+        if tokens[self.i].type == TokenType.SEMICOLON:
+            self.i += 1
         else:
             condition = self.expression()
             if not self.check_semicolon():
@@ -271,11 +251,11 @@ class Parser():
 
         increment = None
 
-        if self.curr_type() != TokenType.RIGHT_PAREN:
+        if tokens[self.i].type != TokenType.RIGHT_PAREN:
             increment = self.expression()
 
-        if self.curr_type() == TokenType.RIGHT_PAREN:
-            self.advance()
+        if tokens[self.i].type == TokenType.RIGHT_PAREN:
+            self.i += 1
         else:
             self.trap("expected ')' after a for loop clause")
             return Loop(None, None)
@@ -308,22 +288,15 @@ class Parser():
         self.check_semicolon()
         return stmt
 
-    def expression(self):
-        """\
-        dummy method used to encode the lox grammar explicity in the source.
-        <expression> := <assignment>
-        """
-        return self.assignment()
-
     def assignment(self):
         """\
         assign rvalue to lvalue
         <assignment> := (IDENTIFIER "=" <assignment>) | <logical or>
         """
-        lval = self.logical_or()
+        lval = self.binary()
 
-        if self.curr_type() == TokenType.EQUAL:
-            self.advance()
+        if self.tokens[self.i].type == TokenType.EQUAL:
+            self.i += 1
             rval = self.assignment()
 
             if isinstance(lval, Variable):
@@ -338,120 +311,69 @@ class Parser():
         #is just some expression.
         return lval
 
-    def logical_or(self):
-        """\
-        <logical or> := <logical and> ("or" <logical and>)*
-        """
-        expr = self.logical_and()
-
-        if self.curr_type() == TokenType.OR:
-            self.advance()
-
-            left = expr
-            tok = self.prev_token()
-            right = self.logical_and()
-
-            return Logical(left, tok, right)
-
-        return expr
+    #encodes the lox grammar explicitly in the source without costing a call.
+    #<expression> := <assignment>
+    expression = assignment
 
-    def logical_and(self):
+    def binary(self, min_prec = 1):
         """\
+        the binary operator grammar rules, parsed by precedence climbing so that
+        one loop replaces a method per precedence level.
+        <logical or> := <logical and> ("or" <logical and>)*
         <logical and> := <equality> ("and" <equality>)*
-        """
-        expr = self.equality()
-
-        if self.curr_type() == TokenType.AND:
-            self.advance()
-
-            left = expr
-            tok = self.prev_token()
-            right = self.logical_and()
-
-            return Logical(left, tok, right)
-
-        return expr
-
-    def equality(self):
-        """\
         <equality> := <comparison> (("==" | "!=") <comparison>)*
-        """
-        expr = self.comparison()
-
-        types = set([TokenType.EQUAL_EQUAL, TokenType.BANG_EQUAL])
-
-        while self.curr_type() in types:
-            self.advance()
-
-            left = expr
-            operator = self.prev_token()
-            right = self.comparison()
-
-            expr = Binary(left, operator, right)
-
-        return expr
-
-    def comparison(self):
-        """\
         <comparison> := <term> ((">" | "<" | "<=" | ">=") <term>)*
-        """
-        expr = self.term()
-
-        types = set([TokenType.GREATER, TokenType.GREATER_EQUAL, \
-                     TokenType.LESS, TokenType.LESS_EQUAL])
-
-        while self.curr_type() in types:
-            self.advance()
+        <term> := <factor> (("+" | "-") <factor>)*
+        <factor> := <unary> (("*" | "/") <unary>)*
 
-            left = expr
-            operator = self.prev_token()
-            right = self.term()
+        @min_prec: lowest precedence level this call may consume
+        """
+        #productions read self.tokens directly and step self.i themselves. a
+        #token that has just been matched against a type other than EOF is
+        #never the last token, so stepping past it needs no bounds check.
+        tokens = self.tokens
+        precedence = Parser.precedence
+        expr = self.unary()
 
-            expr = Binary(left, operator, right)
+        while True:
+            operator = tokens[self.i]
+            prec = precedence.get(operator.type)
 
-        return expr
+            if prec is None or prec < min_prec:
+                return expr
 
-    def term(self):
-        """\
-        <term> := <factor> (("+" | "-") <factor>)*
-        """
-        expr = self.factor()
-
-        while self.curr_type() in set([TokenType.PLUS, TokenType.MINUS]):
-            self.advance()
+            self.i += 1
 
             left = expr
-            operator = self.prev_token()
-            right = self.factor()
+            right = self.binary(prec + 1)
 
-            expr = Binary(left, operator, right)
-
-        return expr
+            if prec <= Parser.logical_prec:
+                expr = Logical(left, operator, right)
+            else:
+                expr = self.fold(left, operator, right)
 
-    def factor(self):
+    def unary(self):
         """\
-        <factor> := <unary> (("*" | "/") <unary>)*
+        <unary> := ("!" | "-") <unary> | <primary>
         """
-        expr = self.unary()
+        operator = self.tokens[self.i]
 
-        while self.curr_type() in set([TokenType.STAR, TokenType.SLASH]):
-            self.advance()
-
-            left = expr
-            operator = self.prev_token()
+        if operator.type in Parser.unary_types:
+            self.i += 1
             right = self.unary()
 
-            expr = Binary(left, operator, right)
+            #fold unary operations on literals, see self.fold()
+            if isinstance(right, Literal):
+                val = right.value
+                line = operator.line
 
-        return expr
+                if operator.type == TokenType.BANG:
+                    val = val is None or val is False
+                    return Literal(self.constant(val, line))
+                elif type(val) is float:
+                    return Literal(self.constant(-val, line))
 
-    def unary(self):
-        """\
-        <unary> := ("!" | "-") <unary> | <primary>
-        """
-        if self.curr_type() in set([TokenType.BANG, TokenType.MINUS]):
-            self.advance()
-            return Unary(self.prev_token(), self.unary())
+            return Unary(operator, right)
 
         return self.primary()
 
@@ -460,24 +382,28 @@ class Parser():
         <primary> := NUMBER | STRING | "true" | "false" | "nil"
         <primary> := "(" <expression> ")"
         """
-        types = set([TokenType.NUMBER, TokenType.STRING, TokenType.NIL, \
-                     TokenType.TRUE, TokenType.FALSE])
-
-        if self.curr_type() in types:
-            expr = Literal(self.curr_token())
-            self.advance()
-        elif self.curr_type() == TokenType.LEFT_PAREN:
-            self.advance()
-            expr = Grouping(self.expression())
-
-            if self.curr_type() == TokenType.RIGHT_PAREN:
-                self.advance()
+        tok = self.tokens[self.i]
+        tok_type = tok.type
+
+        if tok_type in Parser.literal_types:
+            expr = Literal(tok)
+            self.i += 1
+        elif tok_type == TokenType.IDENTIFIER:
+            expr = Variable(tok)
+            self.i += 1
+        elif tok_type == TokenType.LEFT_PAREN:
+            self.i += 1
+            expr = self.expression()
+
+            #a grouped literal is just the literal, which lets it be folded
+            if not isinstance(expr, Literal):
+                expr = Grouping(expr)
+
+            if self.tokens[self.i].type == TokenType.RIGHT_PAREN:
+                self.i += 1
             else:
                 self.trap("missing right parenthesis for grouped expression")
-        elif self.curr_type() == TokenType.IDENTIFIER:
-            expr = Variable(self.curr_token())
-            self.advance()
-        elif self.curr_type() == TokenType.EOF:
+        elif tok_type == TokenType.EOF:
             #this situation occurs when the user has a grammar error at the
             #end of file such as "3-". In this situation, the parser has been
             #passing the EOF token along the call stack. The else branch can
@@ -488,13 +414,46 @@ class Parser():
             tok = self.prev_token()
             self.trap("misplaced symbol '{}' at end of file".format(tok.lexeme))
         else:
-            lexeme = (self.tokens[self.i]).lexeme
-            self.trap("misplaced symbol '{}'".format(lexeme))
+            self.trap("misplaced symbol '{}'".format(tok.lexeme))
             #dummy statement will be added to program tree
             expr = None
 
         return expr
 
+    def fold(self, left, operator, right):
+        """\
+        evaluate a binary operation on two literals at parse time so the subtree
+        collapses into a single literal and is never walked by the interpreter.
+        operands of mismatched types are not folded, nor is division by zero;
+        the interpreter decides how to handle them at runtime.
+        """
+        if isinstance(left, Literal) and isinstance(right, Literal):
+            lval = left.value
+            rval = right.value
+
+            if operator.type != TokenType.SLASH or rval != 0.0:
+                try:
+                    val = Binary.dispatch[operator.type](lval, rval)
+                except TypeError:
+                    pass
+                else:
+                    return Literal(self.constant(val, operator.line))
+
+        return Binary(left, operator, right)
+
+    def constant(self, val, line):
+        """\
+        helper function: synthesize the token of a folded literal value
+        """
+        if val is True:
+            return Token(TokenType.TRUE, line, "true", val)
+        elif val is False:
+            return Token(TokenType.FALSE, line, "false", val)
+        elif type(val) is str:
+            return Token(TokenType.STRING, line, f'"{val}"', val)
+
+        return Token(TokenType.NUMBER, line, "{}".format(val), val)
+
     def trap(self, msg):
         """\
         push parameters to error handler then enter panic mode to reset at the
@@ -505,17 +464,73 @@ class Parser():
 
         if not self.err.push(line, msg):
             self.err.grow(1)
-            self.error.push(line, "additional errors found (hidden)")
+            self.err.push(line, "additional errors found (hidden)")
+
+            #every later error would be hidden as well, so stop parsing here
+            raise ParseError
 
         #synchronize parser to continue at next program statement
-        types = set([TokenType.CLASS, TokenType.FUN, TokenType.VAR, \
-                     TokenType.FOR, TokenType.IF, TokenType.WHILE, \
-                     TokenType.PRINT, TokenType.RETURN])
+        tokens = self.tokens
+        sync_types = Parser.sync_types
+        i = self.i
+
+        while True:
+            tok_type = tokens[i].type
 
-        while self.curr_type() not in types:
-            if self.curr_type() == TokenType.EOF:
+            if tok_type in sync_types:
+                self.i = i
+                return
+
+            if tok_type == TokenType.EOF:
                 #no statements left in program so no need to continue parsing
                 #unwind call stack back to self.program and let it handle return
+                self.i = i
                 raise ParseError
-            else:
-                self.advance()
+
+            i += 1
+
+    #statement keyword dispatch for self.statement(), keyed on the token type of
+    #the leading token. expression statements have no keyword and fall through.
+    stmt_table = {
+        TokenType.PRINT:        print_stmt,
+        TokenType.LEFT_BRACE:   block,
+        TokenType.IF:           branch_stmt,
+        TokenType.WHILE:        while_stmt,
+        TokenType.FOR:          for_stmt
+    }
+
+    #implicit initializer of a declaration without one. literals are never
+    #modified after construction, so every declaration shares this node.
+    nil = Literal(Token(TokenType.NIL, -1, "nil", None))
+
+    #binary operator precedence levels for self.binary(), all left associative.
+    #levels up to logical_prec build short circuiting Logical nodes.
+    precedence = {
+        TokenType.OR:               1,
+        TokenType.AND:              2,
+        TokenType.EQUAL_EQUAL:      3,
+        TokenType.BANG_EQUAL:       3,
+        TokenType.GREATER:          4,
+        TokenType.GREATER_EQUAL:    4,
+        TokenType.LESS:             4,
+        TokenType.LESS_EQUAL:       4,
+        TokenType.PLUS:             5,
+        TokenType.MINUS:            5,
+        TokenType.STAR:             6,
+        TokenType.SLASH:            6
+    }
+
+    logical_prec = 2
+
+    #token types accepted by the remaining productions, built once
+    unary_types = frozenset([TokenType.BANG, TokenType.MINUS])
+
+    literal_types = frozenset([TokenType.NUMBER, TokenType.STRING, \
+                               TokenType.NIL, TokenType.TRUE, TokenType.FALSE])
+
+    block_end_types = frozenset([TokenType.RIGHT_BRACE, TokenType.EOF])
+
+    #statement keywords the parser synchronizes to after an error
+    sync_types = frozenset([TokenType.CLASS, TokenType.FUN, TokenType.VAR, \
+                            TokenType.FOR, TokenType.IF, TokenType.WHILE, \
+                            TokenType.PRINT, TokenType.RETURN])
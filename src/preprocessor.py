@@ -3,10 +3,27 @@
 # Lightweight and minimal preprocessor to allow for debugging toggle switches.
 # The preprocessor is only valid for lox source executed from script.
 
+import re
+
+#every pragma switch, the names are the keys of Preprocessor.flags. the state
+#must end the word so that a malformed '#pragma tok_debug onward' is left for
+#the tokenizer to reject rather than read as 'on'.
+pragma = re.compile(r"#pragma (tok_debug|parse_debug|env_debug) (on|off)\b")
+
 class Preprocessor():
     def __init__(self):
         """\
         @flags: all pragma switches (defaulted to off mode)
+            tok_debug: print every token before parsing
+            parse_debug: print every statement tree before interpretation
+            env_debug: print the global environment after interpretation
+        """
+        self.reset()
+
+    def reset(self):
+        """\
+        return all pragma switches to off mode. the previous flags dictionary
+        is left untouched since it is handed back to the caller of self.scan().
         """
         self.flags = {
             "tok_debug": False,
@@ -22,28 +39,20 @@ class Preprocessor():
         errors on #pragma are carried on to the lox tokenizer which may result
         in untold doom and chaos.
         """
-        if p_src.find("#pragma tok_debug on") >= 0:
-            self.flags["tok_debug"] = True
-            p_src = p_src.replace("#pragma tok_debug on", " ")
-
-        if p_src.find("pragma tok_debug off") >= 0:
-            self.flags["tok_debug"] = False
-            p_src = p_src.replace("#pragma tok_debug off", " ")
+        self.reset()
 
-        if p_src.find("pragma parse_debug on") >= 0:
-            self.flags["parse_debug"] = True
-            p_src = p_src.replace("#pragma parse_debug on", " ")
+        #(name, state) pairs of every pragma seen, collected in the same pass
+        #that blanks them out of the source
+        seen = set()
 
-        if p_src.find("pragma parse_debug off") >= 0:
-            self.flags["parse_debug"] = False
-            p_src = p_src.replace("#pragma parse_debug off", " ")
+        def strip(match):
+            seen.add(match.groups())
+            return " "
 
-        if p_src.find("pragma env_debug on") >= 0:
-            self.flags["env_debug"] = True
-            p_src = p_src.replace("#pragma env_debug on", " ")
+        p_src = pragma.sub(strip, p_src)
 
-        if p_src.find("pragma env_debug off") >= 0:
-            self.flags["env_debug"] = False
-            p_src = p_src.replace("#pragma env_debug off", " ")
+        for name in self.flags:
+            on = (name, "on") in seen
+            self.flags[name] = on and (name, "off") not in seen
 
         return (p_src, self.flags)
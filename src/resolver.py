@@ -0,0 +1,168 @@
+# Copyright (C) 2021 Biren Patel
+# MIT License
+# Static scope resolution over the abstract syntax tree. Every block-scoped
+# variable is assigned a slot in its block environment, and every variable
+# access is annotated with the number of block scopes between the access and the
+# declaration it refers to. Names not declared in any enclosing block resolve to
+# the global environment and are still looked up by name at runtime, since the
+# REPL carries globals between runs and an undefined global is a runtime error.
+#
+# Declarations may only appear directly inside a block or at the top level, so
+# whether a name is declared at a given point in a block is known statically,
+# and so is whether the block needs an environment of its own at all.
+
+from src.node import Binary, Unary, Variable, Literal, Grouping, Assignment
+from src.node import Logical
+
+from src.node import Generic, Printer, VariableDeclaration, Block, Branch
+from src.node import Loop
+
+class Resolver():
+    def __init__(self):
+        """\
+        annotate a parsed program with environment depths and slots
+        @scopes: stack of block scopes, each a map of lexeme to slot index. the
+                 stack is empty while resolving the global scope.
+        """
+        self.scopes = []
+
+    def resolve(self, program):
+        """\
+        resolver entry point, annotates the trees in place
+        @program: list of statement trees generated by the parser
+        """
+        self.scopes = []
+
+        for tree in program:
+            self.visit(tree)
+
+    def visit(self, node):
+        """\
+        resolve a single node and, recursively, its children
+        """
+        Resolver.visit_table[type(node)](self, node)
+
+    def lookup(self, node, lexeme):
+        """\
+        set the depth and slot of a variable access, searching outward from the
+        innermost scope. a name found in no block scope is a global.
+        """
+        depth = 0
+
+        for scope in reversed(self.scopes):
+            slot = scope.get(lexeme)
+
+            if slot is not None:
+                node.depth = depth
+                node.slot = slot
+                return
+
+            depth += 1
+
+        node.depth = depth
+        node.slot = None
+
+    ############################################################################
+    # expression-type nodes
+
+    def visit_literal(self, node):
+        pass
+
+    def visit_variable(self, node):
+        self.lookup(node, node.name.lexeme)
+
+    def visit_unary(self, node):
+        self.visit(node.right)
+
+    def visit_binary(self, node):
+        self.visit(node.left)
+        self.visit(node.right)
+
+    def visit_grouping(self, node):
+        self.visit(node.val)
+
+    def visit_assignment(self, node):
+        self.visit(node.rval)
+        self.lookup(node, node.lval.lexeme)
+
+    def visit_logical(self, node):
+        self.visit(node.left)
+        self.visit(node.right)
+
+    ############################################################################
+    # statement-type nodes
+
+    def visit_generic(self, node):
+        self.visit(node.expr)
+
+    def visit_printer(self, node):
+        self.visit(node.expr)
+
+    def visit_variable_declaration(self, node):
+        """\
+        the initializer is resolved before the name is declared, so it refers
+        to any outer variable of the same name. a redeclaration within the same
+        scope reuses the existing slot.
+        """
+        self.visit(node.initializer)
+
+        if not self.scopes:
+            node.slot = None
+            return
+
+        scope = self.scopes[-1]
+        lexeme = node.name.lexeme
+        slot = scope.get(lexeme)
+
+        if slot is None:
+            slot = len(scope)
+            scope[lexeme] = slot
+
+        node.slot = slot
+
+    def visit_block(self, node):
+        """\
+        a block without declarations of its own gets no scope, its statements
+        resolve as if they were written directly in the enclosing block.
+        """
+        statements = node.statements
+        scoped = any(type(tree) is VariableDeclaration for tree in statements)
+
+        if scoped:
+            self.scopes.append({})
+
+        for tree in statements:
+            self.visit(tree)
+
+        if scoped:
+            node.size = len(self.scopes.pop())
+        else:
+            node.size = None
+
+    def visit_branch(self, node):
+        self.visit(node.condition)
+        self.visit(node.then_branch)
+
+        if node.else_branch is not None:
+            self.visit(node.else_branch)
+
+    def visit_loop(self, node):
+        self.visit(node.condition)
+        self.visit(node.body)
+
+    #node class dispatch for self.visit()
+    visit_table = {
+        Literal:                visit_literal,
+        Variable:               visit_variable,
+        Unary:                  visit_unary,
+        Binary:                 visit_binary,
+        Grouping:               visit_grouping,
+        Assignment:             visit_assignment,
+        Logical:                visit_logical,
+        Generic:                visit_generic,
+        Printer:                visit_printer,
+        VariableDeclaration:    visit_variable_declaration,
+        Block:                  visit_block,
+        Branch:                 visit_branch,
+        Loop:                   visit_loop
+    }
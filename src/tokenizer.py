@@ -2,54 +2,63 @@
 # MIT License
 # Convert lox raw source code to a list of tokens
 
-from enum import Enum
+import re
+from sys import intern
 from src.error import ErrorHandler
 
-class TokenType(Enum):
+class TokenType():
     """\
-    All tokens, keywords, and literals allowed in source by the lox language
+    All tokens, keywords, and literals allowed in source by the lox language.
+    members are plain ints rather than enum members, so that reading one is an
+    ordinary class attribute lookup and comparisons, set membership and dict
+    lookups on token types take the fast integer path.
     """
-    LEFT_PAREN = '('
-    RIGHT_PAREN = ')'
-    LEFT_BRACE = '{'
-    RIGHT_BRACE = '}'
-    COMMA = ','
-    DOT = '.'
-    MINUS = '-'
-    PLUS = '+'
-    SEMICOLON = ';'
-    SLASH = '/'
-    STAR = '*'
-    BANG = '!'
-    BANG_EQUAL = '!='
-    EQUAL = '='
-    EQUAL_EQUAL = '=='
-    GREATER = '>'
-    GREATER_EQUAL = '>='
-    LESS = '<'
-    LESS_EQUAL = '<='
-    AND = 'and'
-    CLASS = 'class'
-    ELSE = 'else'
-    FALSE = 'false'
-    FUN = 'fun'
-    FOR = 'for'
-    IF = 'if'
-    NIL = 'nil'
-    OR = 'or'
-    PRINT = 'print'
-    RETURN = 'return'
-    SUPER = 'super'
-    THIS = 'this'
-    TRUE = 'true'
-    VAR = 'var'
-    WHILE = 'while'
-    EOF = 'EOF'
-    IDENTIFIER = 'xyz'
-    STRING = 'abc'
-    NUMBER = '123'
+    LEFT_PAREN = 0
+    RIGHT_PAREN = 1
+    LEFT_BRACE = 2
+    RIGHT_BRACE = 3
+    COMMA = 4
+    DOT = 5
+    MINUS = 6
+    PLUS = 7
+    SEMICOLON = 8
+    SLASH = 9
+    STAR = 10
+    BANG = 11
+    BANG_EQUAL = 12
+    EQUAL = 13
+    EQUAL_EQUAL = 14
+    GREATER = 15
+    GREATER_EQUAL = 16
+    LESS = 17
+    LESS_EQUAL = 18
+    AND = 19
+    CLASS = 20
+    ELSE = 21
+    FALSE = 22
+    FUN = 23
+    FOR = 24
+    IF = 25
+    NIL = 26
+    OR = 27
+    PRINT = 28
+    RETURN = 29
+    SUPER = 30
+    THIS = 31
+    TRUE = 32
+    VAR = 33
+    WHILE = 34
+    EOF = 35
+    IDENTIFIER = 36
+    STRING = 37
+    NUMBER = 38
+
+#TokenType member names indexed by value, for Token.__repr__
+type_names = {v: k for k, v in vars(TokenType).items() if type(v) is int}
 
 class Token():
+    __slots__ = ('type', 'line', 'lexeme', 'literal')
+
     def __init__(self, type, line, lexeme, literal):
         """\
         @type: see class TokenType
@@ -63,22 +72,43 @@ class Token():
         self.literal = literal
 
     def __repr__(self):
-        msg = "line {}: {} ({},{})"
-        return msg.format(self.line, self.type, self.lexeme, self.literal)
+        name = type_names[self.type]
+        return f"line {self.line}: TokenType.{name} " \
+               f"({self.lexeme},{self.literal})"
+
+#master pattern over every lexical class. leading whitespace is folded into
+#each match so it never costs an iteration of its own, and a newline swallows
+#the blank lines and indentation after it. alternatives are tried
+#in order, so malformed strings and numbers are caught before a well formed
+#prefix of them could match, and any other character falls through to UNKNOWN.
+scanner = re.compile(r"""
+    [ \t\r\f\v]*
+    (?:
+        (?P<WORD>[^\W\d]\w*)
+      | (?P<COMMENT>//[^\n]*)
+      | (?P<OPERATOR>[!=<>]=?|[(){},.\-+;*/])
+      | (?P<NEWLINE>\n[ \t\r\f\v\n]*)
+      | (?P<BADNUMBER>[0-9]+(?:\.[0-9]+)?\.(?![0-9]))
+      | (?P<NUMBER>[0-9]+(?:\.[0-9]+)?)
+      | (?P<STRING>"[^"\n]*")
+      | (?P<BADSTRING>")
+      | (?P<UNKNOWN>.)
+    )
+""", re.VERBOSE)
 
 class Tokenizer():
     def __init__(self):
         """\
         convert input source string into a List[Token]
+        the token list is only ever held by the caller of self.tokenize(), so a
+        reused tokenizer never pins the tokens of its previous run.
         """
-        self.src = " "
         self.err = ErrorHandler()
         self.line = 0
-        self.i = 0 #src index
-        self.tokens = []
 
-        #inverse mapping of single char TokenTypes, except slash
-        self.single_map = {
+        #inverse mapping of punctuation and operators, one or two chars wide, so
+        #the scanner needs only one group and one branch for all of them
+        self.operator_map = {
         '(': TokenType.LEFT_PAREN,
         ')': TokenType.RIGHT_PAREN,
         '{': TokenType.LEFT_BRACE,
@@ -88,11 +118,8 @@ class Tokenizer():
         '-': TokenType.MINUS,
         '+': TokenType.PLUS,
         ';': TokenType.SEMICOLON,
-        '*': TokenType.STAR
-        }
-
-        #inverse mapping of single/double tokens from TokenType
-        self.double_map = {
+        '*': TokenType.STAR,
+        '/': TokenType.SLASH,
         '!': TokenType.BANG,
         '!=': TokenType.BANG_EQUAL,
         '=': TokenType.EQUAL,
@@ -123,172 +150,79 @@ class Tokenizer():
         'while': TokenType.WHILE
         }
 
-        #whitespace characters excluding newline and comments
-        self.whitespace_set = set([' ', '\t', '\r', '\f', '\v'])
-
-        #digit characters
-        self.digit_set = set(['0','1','2','3','4','5','6','7','8','9'])
-
-    def handle_double(self):
-        """\
-        single/double tokens helper for self.tokenize
-        """
-        double = self.src[self.i] + self.src[self.i + 1]
-
-        if double in self.double_map:
-            tok = Token(self.double_map[double], self.line, double, None)
-            self.tokens.append(tok)
-            self.i += 1
-        else:
-            char = self.src[self.i]
-            tok = Token(self.double_map[char], self.line, char, None)
-            self.tokens.append(tok)
-
-    def handle_digit(self):
-        """\
-        number literals helper for self.tokenize.
-        sets self.i to negative on error.
-        """
-        j = self.i
-
-        while self.src[j] in self.digit_set:
-            j += 1
-
-            if self.src[j] == '.':
-                if self.src[j + 1] in self.digit_set:
-                    j += 1
-                else:
-                    self.i = -1
-                    return
-
-        lexeme = self.src[self.i:j]
-        literal = float(lexeme)
-        tok = Token(TokenType.NUMBER, self.line, lexeme, literal)
-        self.tokens.append(tok)
-
-        self.i = j - 1
-
-    def handle_slash(self):
-        """\
-        slash and comments helper for self.tokenize.
-        i is set to the index of the last-parsed charcter of the comment
-        """
-        if self.src[self.i + 1] == '/':
-            self.i = self.i + self.src[self.i:].find('\n') - 1
-            assert(self.i > 0 and "str.find retval is not -1")
-        else:
-            tok = Token(TokenType.SLASH, self.line, '/', None)
-            self.tokens.append(tok)
-
-    def handle_string(self):
-        """\
-        string literal helper function for self.tokenize.
-        sets i to negative on error, else i is index of closing quotation
-        """
-        quote = self.src[self.i + 1:].find('"')
-        newline = self.src[self.i + 1:].find('\n')
-
-        if quote != -1 and quote < newline:
-            lexeme = self.src[self.i: self.i + quote + 2]
-            literal = self.src[self.i + 1: self.i + quote + 1]
-            tok = Token(TokenType.STRING, self.line, lexeme, literal)
-            self.tokens.append(tok)
-        else:
-            self.i = -1
-
-        self.i = self.i + quote + 1
-
-    def handle_word(self):
-        """\
-        identifier and keywords helper function for self.tokenize.
-        returns the word for futher analysis.
-        i is set to last char in the identifier/keyword
-        """
-        j = self.i
-        id = self.src
-
-        while id[j].isalpha() or id[j].isdigit() or id[j] == '_':
-            j += 1
-
-        word = self.src[self.i:j]
-        self.i = j - 1
-
-        if word in self.keywords_map:
-            #for keyword 'nil', literal = None is the actual literal value
-            tok = Token(self.keywords_map[word], self.line, word, None)
-
-            #add literal values for true/false to assist the interpreter
-            #lox bools will reduce to python bools
-            if tok.type == TokenType.TRUE:
-                tok.literal = True
-            elif tok.type == TokenType.FALSE:
-                tok.literal = False
-
-            self.tokens.append(tok)
-        else:
-            tok = Token(TokenType.IDENTIFIER, self.line, word, word)
-            self.tokens.append(tok)
+        #literal values of keywords, lox bools reduce to python bools and the
+        #literal of every other keyword, including nil, is None
+        self.keywords_literal = {'true': True, 'false': False}
 
-    #via pylox.py tokenizer always expects a newline terminated input
-    #therefore no try-catch for IndexError required for src[i + 1] access
     def tokenize(self, src, limit = 3):
         """\
-        @src: source code, newline terminated so that src[i + 1] is valid
+        @src: source code, newline terminated
         @limit: internal ErrorHandler limit
         """
         #reset attrs on multiple calls
-        self.src = src
         self.err = ErrorHandler(limit)
         self.line = 1
-        self.i = 0
-        self.tokens = []
 
-        while self.i < len(self.src):
-            assert(self.i >= 0 and "index is not strictly increasing")
-            assert(self.line >= 1 and "line is not strictly increasing")
+        tokens = []
+        append = tokens.append
+        line = 1
 
-            if (char := self.src[self.i]) in self.single_map:
-                tok = Token(self.single_map[char], self.line, char, None)
-                self.tokens.append(tok)
-            elif self.src[self.i] in self.double_map:
-                self.handle_double()
-            elif self.src[self.i] in self.whitespace_set:
-                pass
-            elif self.src[self.i] == '\n':
-                self.line += 1
-            elif self.src[self.i] == '/':
-                self.handle_slash()
-            elif self.src[self.i] in self.digit_set:
-                self.handle_digit()
+        operator_map = self.operator_map
+        keywords_map = self.keywords_map
+        keywords_literal = self.keywords_literal
 
-                if self.i < 0:
-                    self.err.grow(1)
-                    self.err.push(line, 'number formatted incorrectly')
-                    break
-            elif self.src[self.i] == '"':
-                self.handle_string()
+        #token types built in the loop are bound to locals once
+        IDENTIFIER = TokenType.IDENTIFIER
+        NUMBER = TokenType.NUMBER
+        STRING = TokenType.STRING
 
-                if self.i < 0:
-                    self.err.grow(1)
-                    self.err.push(line, 'string not terminated')
-                    break
-            elif self.src[self.i].isalpha() or self.src[self.i] == '_':
-                self.handle_word()
+        for match in scanner.finditer(src):
+            kind = match.lastgroup
+            lexeme = match[kind]
+
+            if kind == 'WORD':
+                type = keywords_map.get(lexeme)
+
+                if type is None:
+                    #interned so environment lookups compare keys by identity
+                    lexeme = intern(lexeme)
+                    append(Token(IDENTIFIER, line, lexeme, lexeme))
+                else:
+                    literal = keywords_literal.get(lexeme)
+                    append(Token(type, line, lexeme, literal))
+            elif kind == 'OPERATOR':
+                append(Token(operator_map[lexeme], line, lexeme, None))
+            elif kind == 'NEWLINE':
+                line += lexeme.count('\n')
+            elif kind == 'NUMBER':
+                append(Token(NUMBER, line, lexeme, float(lexeme)))
+            elif kind == 'STRING':
+                append(Token(STRING, line, lexeme, lexeme[1:-1]))
+            elif kind == 'COMMENT':
+                pass
+            elif kind == 'BADNUMBER':
+                self.err.grow(1)
+                self.err.push(line, 'number formatted incorrectly')
+                break
+            elif kind == 'BADSTRING':
+                self.err.grow(1)
+                self.err.push(line, 'string not terminated')
+                break
             else:
-                msg = "unknown symbol {}".format(self.src[self.i])
+                msg = "unknown symbol {}".format(lexeme)
 
-                if not self.err.push(self.line, msg):
+                if not self.err.push(line, msg):
                     self.err.grow(1)
-                    self.err.push(self.line, 'additional errors found (hidden)')
+                    self.err.push(line, 'additional errors found (hidden)')
                     break
 
-            self.i += 1
+        self.line = line
 
         #place EOF synthetically on previous line
         if not self.err:
-            self.tokens.append(Token(TokenType.EOF, self.line - 1, None, None))
+            tokens.append(Token(TokenType.EOF, line - 1, None, None))
 
         #if there are no errors then tokens must be nonempty
-        assert(bool(self.err) == True or bool(self.tokens) == True)
+        assert(bool(self.err) == True or bool(tokens) == True)
 
-        return (self.tokens, self.err)
+        return (tokens, self.err)
@@ -92,3 +92,39 @@ class TestErrorHandler(TestCase):
         #assert
         for i, val in enumerate(err):
             self.assertEqual(msgs[i], val)
+
+    def test_push_after_grow_on_full_queue_is_true(self):
+        #arrange
+        err = ErrorHandler(1)
+
+        #act
+        err.push(1, "foo")
+        err.grow(1)
+        status = err.push(2, "SUT")
+
+        #assert
+        self.assertTrue(status)
+
+    def test_negative_limit_never_rejects_push(self):
+        #arrange
+        err = ErrorHandler(-1)
+
+        #act
+        status = all(err.push(i, "foo") for i in range(100))
+
+        #assert
+        self.assertTrue(status)
+
+    def test_reset_discards_previous_errors_on_iteration(self):
+        #arrange
+        msgs = ["line 3: test error 3"]
+        err = ErrorHandler(2)
+
+        #act
+        err.push(1, "test error 1")
+        err.push(2, "test error 2")
+        err.reset()
+        err.push(3, "test error 3")
+
+        #assert
+        self.assertEqual(msgs, list(err))
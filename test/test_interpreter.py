@@ -0,0 +1,90 @@
+# Copyright (C) 2021, Biren Patel
+# MIT License
+# Tree walk interpreter unit tests
+
+from contextlib import redirect_stdout
+from io import StringIO
+from src.interpreter import Interpreter
+from src.parser import Parser
+from src.resolver import Resolver
+from src.tokenizer import Tokenizer
+from unittest import TestCase
+
+def execute(src):
+    """\
+    run newline terminated lox source
+    returns: (exit status, captured stdout, list of runtime errors, env)
+    """
+    tokens, _ = Tokenizer().tokenize(src)
+    program, _ = Parser().parse(tokens)
+    Resolver().resolve(program)
+    out = StringIO()
+
+    with redirect_stdout(out):
+        status, err, env = Interpreter(None).interpret(program)
+
+    return (status, out.getvalue(), list(err), env)
+
+class TestInterpreter(TestCase):
+    def test_block_scoping(self):
+        #arrange
+        src = 'var a = 1; { var a = 2; { print a; a = 3; } print a; } ' \
+              'print a;\n'
+
+        #act
+        _, out, _, _ = execute(src)
+
+        #assert
+        self.assertEqual("2.0\n3.0\n1.0\n", out)
+
+    def test_shadowing_before_declaration(self):
+        #arrange
+        src = 'var a = 1; { print a; var a = a + 1; print a; ' \
+              '{ a = 5; var a = 3; print a; } print a; }\n'
+
+        #act
+        _, out, _, _ = execute(src)
+
+        #assert
+        self.assertEqual("1.0\n2.0\n3.0\n5.0\n", out)
+
+    def test_runtime_error_unwinds_to_global_environment(self):
+        #act
+        status, _, err, env = execute('{ { print -"a"; } }\n')
+
+        #assert
+        self.assertEqual(1, status)
+        self.assertEqual(["line 1: operand of '-' must be a number"], err)
+        self.assertIsNone(env.parent)
+
+    def test_zero_is_truthy(self):
+        #act
+        src = 'if (0) print "t"; else print "f"; print !0; print 0 or 1;\n'
+        _, out, _, _ = execute(src)
+
+        #assert
+        self.assertEqual("t\nFalse\n0.0\n", out)
+
+    def test_chained_logical_operators(self):
+        #act
+        src = 'print nil or false or 3; print 1 and 2 and 3;\n'
+        _, out, _, _ = execute(src)
+
+        #assert
+        self.assertEqual("3.0\n3.0\n", out)
+
+    def test_signed_zero_is_preserved(self):
+        #act
+        _, out, _, _ = execute('var z = 0; print -0; print z; print 0 * -1;\n')
+
+        #assert
+        self.assertEqual("-0.0\n0.0\n-0.0\n", out)
+
+    def test_unresolved_tree_is_rejected(self):
+        #arrange
+        tokens, _ = Tokenizer().tokenize('{ var a = 1; } { print a; }\n')
+        program, _ = Parser().parse(tokens)
+
+        #act and assert
+        with self.assertRaises(AttributeError):
+            Interpreter(None).interpret(program)
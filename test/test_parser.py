@@ -0,0 +1,86 @@
+# Copyright (C) 2021, Biren Patel
+# MIT License
+# Parser unit tests
+
+from src.interpreter import Interpreter
+from src.node import Binary, Literal
+from src.parser import Parser
+from src.resolver import Resolver
+from src.tokenizer import Tokenizer
+from unittest import TestCase
+
+def parse(src, limit = 10):
+    """\
+    parse newline terminated lox source
+    returns: (list of statement trees or None, list of syntax errors)
+    """
+    tokens, _ = Tokenizer().tokenize(src)
+    program, err = Parser().parse(tokens, limit)
+    return (program, list(err))
+
+def run(program):
+    """\
+    returns: list of runtime errors from interpreting a parsed program
+    """
+    Resolver().resolve(program)
+    _, err, _ = Interpreter(None).interpret(program)
+    return list(err)
+
+class TestParser(TestCase):
+    def test_unclosed_block_reports_missing_brace_at_end_of_file(self):
+        #act
+        program, err = parse('print 1;\n{\nprint 2;\n')
+
+        #assert
+        self.assertIsNone(program)
+        self.assertEqual(["line 3: expected '}' at end of file"], err)
+
+    def test_unclosed_block_on_one_line(self):
+        #act
+        program, err = parse('{ print 1;\n')
+
+        #assert
+        self.assertEqual(["line 1: expected '}' at end of file"], err)
+
+    def test_parsing_stops_once_error_limit_is_reached(self):
+        #arrange
+        src = 'var ;\n' * 6
+
+        #act
+        program, err = parse(src, 3)
+
+        #assert
+        expected = ['line {}: missing variable identifier'.format(i)
+                    for i in range(1, 4)]
+        expected.append('line 4: additional errors found (hidden)')
+
+        self.assertIsNone(program)
+        self.assertEqual(expected, err)
+
+    def test_literal_arithmetic_folds_to_single_literal(self):
+        #act
+        program, err = parse('print (1 + 2) * 3;\n')
+
+        #assert
+        expr = program[0].expr
+        self.assertIsInstance(expr, Literal)
+        self.assertEqual(9.0, expr.value)
+
+    def test_division_by_zero_is_not_folded(self):
+        #act
+        program, _ = parse('var a = 1;\nprint 1 / 0;\n')
+        err = run(program)
+
+        #assert
+        self.assertIsInstance(program[1].expr, Binary)
+        self.assertEqual(['line 2: division by zero'], err)
+
+    def test_mismatched_types_are_not_folded(self):
+        #act
+        program, _ = parse('var a = 1;\n\nprint "a" - 1;\n')
+        err = run(program)
+
+        #assert
+        expected = ["line 3: cannot perform '-' on mismatched types"]
+        self.assertIsInstance(program[1].expr, Binary)
+        self.assertEqual(expected, err)
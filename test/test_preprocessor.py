@@ -0,0 +1,38 @@
+# Copyright (C) 2021, Biren Patel
+# MIT License
+# Preprocessor unit tests
+
+from src.preprocessor import Preprocessor
+from unittest import TestCase
+
+class TestPreprocessor(TestCase):
+    def test_pragma_on_sets_flag_and_is_stripped(self):
+        #act
+        src, flags = Preprocessor().scan('#pragma tok_debug on\nprint 1;\n')
+
+        #assert
+        self.assertTrue(flags["tok_debug"])
+        self.assertEqual(' \nprint 1;\n', src)
+
+    def test_off_after_on_leaves_flag_false(self):
+        #arrange
+        p_src = '#pragma env_debug on\nprint 1;\n#pragma env_debug off\n'
+
+        #act
+        src, flags = Preprocessor().scan(p_src)
+
+        #assert
+        self.assertFalse(flags["env_debug"])
+        self.assertNotIn('#pragma', src)
+
+    def test_malformed_pragma_is_rejected(self):
+        #arrange
+        p_src = '#pragma tok_debug onward\n#pragma env_debug maybe\n' \
+                '#pragma vm on\n'
+
+        #act
+        src, flags = Preprocessor().scan(p_src)
+
+        #assert
+        self.assertFalse(any(flags.values()))
+        self.assertEqual(p_src, src)
@@ -0,0 +1,64 @@
+# Copyright (C) 2021, Biren Patel
+# MIT License
+# Tokenizer unit tests
+
+from src.tokenizer import Tokenizer, TokenType
+from unittest import TestCase
+
+class TestTokenizer(TestCase):
+    def test_tokens_carry_type_line_and_literal(self):
+        #arrange
+        src = 'var x = 1.5; // note\nprint x >= "s";\n'
+
+        #act
+        tokens, err = Tokenizer().tokenize(src)
+
+        #assert
+        self.assertFalse(bool(err))
+        self.assertEqual(
+            [(t.type, t.line, t.literal) for t in tokens],
+            [(TokenType.VAR, 1, None), (TokenType.IDENTIFIER, 1, 'x'),
+             (TokenType.EQUAL, 1, None), (TokenType.NUMBER, 1, 1.5),
+             (TokenType.SEMICOLON, 1, None), (TokenType.PRINT, 2, None),
+             (TokenType.IDENTIFIER, 2, 'x'), (TokenType.GREATER_EQUAL, 2, None),
+             (TokenType.STRING, 2, 's'), (TokenType.SEMICOLON, 2, None),
+             (TokenType.EOF, 2, None)])
+
+    def test_unterminated_string_is_an_error(self):
+        #act
+        tokens, err = Tokenizer().tokenize('print "abc;\nprint "x";\n')
+
+        #assert
+        self.assertEqual(['line 1: string not terminated'], list(err))
+
+    def test_number_with_trailing_dot_is_an_error(self):
+        #act
+        tokens, err = Tokenizer().tokenize('print 1.;\n')
+
+        #assert
+        self.assertEqual(['line 1: number formatted incorrectly'], list(err))
+
+    def test_unknown_symbols_are_reported_per_line(self):
+        #act
+        tokens, err = Tokenizer().tokenize('print 1 @ 2;\nprint 3 # 4;\n')
+
+        #assert
+        expected = ['line 1: unknown symbol @', 'line 2: unknown symbol #']
+        self.assertEqual(expected, list(err))
+
+    def test_token_repr_names_its_type(self):
+        #act
+        tokens, err = Tokenizer().tokenize('print 1;\n')
+
+        #assert
+        self.assertEqual('line 1: TokenType.NUMBER (1,1.0)', repr(tokens[1]))
+
+    def test_tokenizer_does_not_retain_tokens(self):
+        #arrange
+        tokenizer = Tokenizer()
+
+        #act
+        tokens, err = tokenizer.tokenize('print 1;\n')
+
+        #assert
+        self.assertFalse(any(v is tokens for v in vars(tokenizer).values()))